@@ -1,6 +1,10 @@
-from functools import reduce
+from math import isqrt, log
 from random import random
 
+# from this Erdös-Renyi parameter on, few pairs of vertices are edges,
+# so the edges are sampled directly instead of every pair
+SPARSE_P = 0.9
+
 
 class Graph:
     """Class for graphs manipulation, primarily working with it's adjacency matrix."""
@@ -9,6 +13,10 @@ class Graph:
         """
         If p is passed, an Erdös-Renyi matrix is used. Else, M will be used.
 
+        The graph is unweighted: any non zero cell of M is stored as an edge (1), so
+        degrees count adjacent vertices and both `__str__` and `getMatrix` show 0/1
+        cells (`getMatrix` returns a new matrix, not M itself).
+
         Parameters
         ----------
             N (int): The graph's number of vertices.
@@ -25,19 +33,55 @@ class Graph:
             elif type(p) is not float:
                 raise TypeError("`p` must be a `float`.")
 
-            M = [[0 for _ in range(N)] for _ in range(N)]
-
-            for i in range(N):
-                for j in range(N):
-                    M[i][j] = M[j][i] = int(random() > p) if i > j else M[i][j]
+            # each row is a bitset: the bit j of matrix[i] is set if (i, j) is an edge
+            matrix = [0] * N
+
+            # in sparse graphs, jump straight from an edge to the next one (in the
+            # lower triangle, row by row): the number of pairs skipped in between
+            # follows a geometric distribution, so only the edges are sampled
+            if p >= SPARSE_P:
+                n_pairs = N * (N - 1) // 2
+                k = -1  # index of the current pair
+
+                # (if p is 1 there are no edges at all)
+                while p < 1:
+                    k += 1 + int(log(1.0 - random()) / log(p))
+                    if k >= n_pairs:
+                        break
+
+                    # the k-th pair's vertices
+                    i = (1 + isqrt(1 + 8 * k)) // 2
+                    j = k - i * (i - 1) // 2
+                    matrix[i] |= 1 << j
+                    matrix[j] |= 1 << i
+
+            else:
+                for i in range(1, N):
+                    # sample each pair of vertices only once (lower triangle)
+                    lower = "".join("1" if random() > p else "0" for _ in range(i))
+                    matrix[i] |= int(lower[::-1] or "0", 2)
+
+                    # and mirror it into the upper triangle (column i)
+                    j = lower.find("1")
+                    while j >= 0:
+                        matrix[j] |= 1 << i
+                        j = lower.find("1", j + 1)
 
         # if p is not passed and either M is not passed or is passed but invalid, returns None
         elif not M or len(M) != N or any(len(row) != N for row in M):
             raise ValueError()
 
+        else:
+            # any non zero cell is an edge
+            matrix = [
+                int("".join("1" if v else "0" for v in reversed(row)) or "0", 2)
+                for row in M
+            ]
+
         self.N = N
         self.p = p
-        self.matrix = M
+        self.matrix = matrix
+        self._degrees = None
 
     def __str__(self) -> str:
         """
@@ -47,19 +91,15 @@ class Graph:
         -------
             str: represents the graph's adjacency matrix.
         """
-        string = ""
-
-        for i in range(self.N):
-            string += "[  "
-            for j in range(self.N):
-                string += str(self.matrix[i][j]) + "  "
-            string += "]\n"
-
-        return string
+        # each row's bits, from the lowest (column 0) to the highest
+        rows = (format(row, f"0{self.N}b")[::-1] for row in self.matrix)
+        return "".join("[  " + "".join(f"{v}  " for v in row) + "]\n" for row in rows)
 
     def getMatrix(self):
         """Getter for the graph's adjacency matrix."""
-        return self.matrix
+        return [
+            [int(v) for v in format(row, f"0{self.N}b")[::-1]] for row in self.matrix
+        ]
 
     def hasEdge(self) -> bool:
         """
@@ -70,14 +110,23 @@ class Graph:
             bool, if vertexPosition is valid (between 1 and self.N).
             None, if not.
         """
-        # If an edge is found in any row
-        # returns True
-        for row in self.matrix:
-            if any(x > 0 for x in row):
-                return True
+        # True if an edge is found in any row
+        return any(self.matrix)
+
+    def degrees(self):
+        """
+        Getter for all vertices' degrees.
 
-        # If no edge is found, returns False
-        return False
+        Returns
+        -------
+            ( int ): Each vertex's degree, in order of position (index + 1).
+        """
+        # the matrix never changes, so the degrees are only summed once
+        if self._degrees is None:
+            # count all edges (set bits) from each vertex's row
+            self._degrees = tuple(bin(row).count("1") for row in self.matrix)
+
+        return self._degrees
 
     def getVertexDegree(self, vertexPosition: int) -> int:
         """
@@ -94,8 +143,7 @@ class Graph:
 
         """
         return (
-            # sum all edges from the vertex's row
-            reduce(lambda acc, cur: acc + cur, self.matrix[vertexPosition - 1], 0)
+            self.degrees()[vertexPosition - 1]
             if 1 <= vertexPosition <= self.N
             else None
         )
@@ -115,19 +163,14 @@ class Graph:
             None, if not.
         """
         return (
-            list(
-                filter(
-                    # filter list for indexes
-                    lambda e: e is not None,
-                    # generates list of indexes+1 (for the adjacent vertices) and None for the non-adjacent vertices
-                    [
-                        vertex + 1 if isAdjacent else None
-                        for vertex, isAdjacent in enumerate(
-                            self.matrix[vertexPosition - 1]
-                        )
-                    ],
+            # indexes+1 of the set bits in the vertex's row
+            [
+                vertex + 1
+                for vertex, isAdjacent in enumerate(
+                    format(self.matrix[vertexPosition - 1], f"0{self.N}b")[::-1]
                 )
-            )
+                if isAdjacent == "1"
+            ]
             if 1 <= vertexPosition <= self.N
             else None
         )
@@ -146,12 +189,12 @@ class Graph:
                 Represents the vertex degree and it's list of adjacent vertices' positions (index + 1), respectively.
             None, if not.
         """
-        return (
-            self.getVertexDegree(self, vertexPosition),
-            self.getAdjacentVertices(vertexPosition)
-            if 1 <= vertexPosition <= self.N
-            else None,
-        )
+        if not 1 <= vertexPosition <= self.N:
+            return None
+
+        # the degree is the number of adjacent vertices
+        adjacent = self.getAdjacentVertices(vertexPosition)
+        return (len(adjacent), adjacent)
 
     def areAdjacent(self, i: int, j: int) -> bool:
         """
@@ -168,7 +211,7 @@ class Graph:
             None, if not.
         """
         return (
-            bool(self.matrix[i - 1][j - 1] or self.matrix[j - 1][i - 1])
+            bool((self.matrix[i - 1] >> (j - 1) | self.matrix[j - 1] >> (i - 1)) & 1)
             if 1 <= i <= self.N and 1 <= j <= self.N
             else None
         )
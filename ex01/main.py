@@ -19,11 +19,19 @@ class Graph:
         if not (0 <= p <= 1):
             raise ValueError("The `p` value is invalid - it must be in [0, 1].")
 
-        M = [[0 for _ in range(N)] for _ in range(N)]
+        # each row is a bitset: the bit j of M[i] is set if (i, j) is an edge
+        M = [0] * N
 
-        for i in range(N):
-            for j in range(N):
-                M[i][j] = M[j][i] = int(random() > p) if i > j else M[i][j]
+        for i in range(1, N):
+            # sample each pair of vertices only once (lower triangle)
+            lower = "".join("1" if random() > p else "0" for _ in range(i))
+            M[i] |= int(lower[::-1] or "0", 2)
+
+            # and mirror it into the upper triangle (column i)
+            j = lower.find("1")
+            while j >= 0:
+                M[j] |= 1 << i
+                j = lower.find("1", j + 1)
 
         self.N = N
         self.p = p
@@ -37,15 +45,9 @@ class Graph:
         -------
             str: represents the graph's adjacency matrix.
         """
-        string = ""
-
-        for i in range(self.N):
-            string += "[  "
-            for j in range(self.N):
-                string += str(self.matrix[i][j]) + "  "
-            string += "]\n"
-
-        return string
+        # each row's bits, from the lowest (column 0) to the highest
+        rows = (format(row, f"0{self.N}b")[::-1] for row in self.matrix)
+        return "".join("[  " + "".join(f"{v}  " for v in row) + "]\n" for row in rows)
 
 
 if __name__ == "__main__":
@@ -1,3 +1,15 @@
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import accumulate, chain
+from os import cpu_count
+
+# below this number of nodes, starting worker processes
+# costs more than running every BFS in this process
+PARALLEL_MIN_NODES = 1000
+
+
 def matrix_to_string(mat: list[list[int]]):
     """
     Convert a matrix to a string.
@@ -10,15 +22,45 @@ def matrix_to_string(mat: list[list[int]]):
     -------
     str: the resulting string.
     """
-    string = ""
+    return "\n".join(" ".join(map(str, row)) for row in mat)
+
+
+def bfs_csr(indptr: array, indices: array, root: int, N: int) -> array:
+    """
+    Perform a Breadth First Search over a graph's CSR arrays, returning the distance from the "root" node to every node.
+
+    Parameters
+    ----------
+    indptr (array[int]): where each node's neighbors start in `indices` (and end, for the next node).
+    indices (array[int]): all nodes' neighbors, contiguously.
+    root (int): the initial node's index.
+    N (int): the graph's number of nodes.
+
+    Returns
+    -------
+    array[int]: distance from "root" to each node (-1 if there's no path to it).
+    """
+    # distance from "root" to each node (-1 while not reached)
+    dist = array("i", [-1]) * N
+    dist[root] = 0
+
+    # list of all nodes to be analyzed - works as queue
+    to_analyze = deque([root])
+
+    # while to_analyze is not empty
+    while to_analyze:
+        # currently being analyzed node (FIFO)
+        curr = to_analyze.popleft()
+        next_dist = dist[curr] + 1
 
-    for row in mat:
-        for i in range(len(row)):
-            string += str(row[i])
-            string += " " if i < len(row) - 1 else "\n"
+        # each neighbor not reached yet is one step further
+        # than the current node, so mark it to be analyzed
+        for node in indices[indptr[curr] : indptr[curr + 1]]:
+            if dist[node] < 0:
+                dist[node] = next_dist
+                to_analyze.append(node)
 
-    # remove trailing newline
-    return string.rstrip()
+    return dist
 
 
 class Graph:
@@ -38,32 +80,51 @@ class Graph:
                 "`N` must be an `int` and `edges` must be a `list` of `tuples` containing two `int`."
             )
 
-        M = [[0 for _ in range(N)] for _ in range(N)]
-        neighbors = {i: set([]) for i in range(N)}
-
-        for edge in edges:
-            if (
-                type(edge) is not tuple
-                or len(edge) != 2
-                or any([(type(v) is not int) for v in edge])
-            ):
-                raise TypeError(
-                    "`edges` must be a `list` of `tuples` containing two `int`."
-                )
-
-            i, j = [v - 1 for v in edge]
-
-            if i >= N or j >= N:
-                raise ValueError("`edges` contain invalid nodes.")
+        # all edges' nodes, contiguously - validated at once (instead of edge by edge)
+        try:
+            nodes = array("i", chain.from_iterable(edges))
+            valid = not set(map(len, edges)) - {2}
+            # (`bool` is an `int` subclass, but it isn't a node)
+            valid = valid and bool not in map(type, chain.from_iterable(edges))
+        except TypeError:  # an edge isn't a sequence or a node isn't an `int`
+            valid = False
+        except OverflowError:  # a node past a C `int`'s range (so, past N)
+            raise ValueError("`edges` contain invalid nodes.") from None
+
+        if not valid:
+            raise TypeError(
+                "`edges` must be a `list` of `tuples` containing two `int`."
+            )
 
-            # register edge
-            M[i][j] = M[j][i] = 1
-            neighbors[i].add(j)
-            neighbors[j].add(i)
+        if nodes and (min(nodes) < 1 or max(nodes) > N):
+            raise ValueError("`edges` contain invalid nodes.")
+
+        # (1-based) endpoints of each edge, both ways
+        sources = nodes[0::2] + nodes[1::2]
+        targets = nodes[1::2] + nodes[0::2]
+
+        # neighbors in CSR form: the neighbors of node
+        # i are indices[indptr[i] : indptr[i + 1]]
+        indptr = array("i", [0]) * (N + 1)
+        for i in sources:
+            indptr[i] += 1  # the nodes are 1-based, so this is (i - 1) + 1
+        indptr = array("i", accumulate(indptr))
+
+        # each row is a bitset: the bit j of M[i] is set if (i, j) is an edge -
+        # filled in the same pass that scatters the arcs into the CSR slices
+        M = [0] * N
+        indices = array("i", [0]) * len(sources)
+        head = indptr[:-1]  # next free position in each node's slice
+        for i, j in zip(sources, targets):
+            i, j = i - 1, j - 1
+            M[i] |= 1 << j
+            indices[head[i]] = j
+            head[i] += 1
 
         self.N = N
         self.matrix = M
-        self.neighbors = neighbors
+        self.indptr = indptr
+        self.indices = indices
 
     def __str__(self) -> str:
         """
@@ -73,54 +134,106 @@ class Graph:
         -------
         str: represents the graph's adjacency matrix.
         """
-        return matrix_to_string(self.matrix)
+        # each row's bits, from the lowest (column 0) to the highest
+        return matrix_to_string(
+            [format(row, f"0{self.N}b")[::-1] for row in self.matrix]
+        )
+
+    def reorder_rcm(self) -> array:
+        """
+        Relabel the graph's nodes in Reverse Cuthill-McKee order, so that neighbor nodes get close indexes.
 
-    def bfs(self, root: int, target: int) -> list[int]:
+        Traversals then jump around less in memory on big sparse graphs. The results of later calls refer to the new indexes.
+
+        Returns
+        -------
+            array[int]: the permutation used - perm[i] is the old index of the node now at index i.
         """
-        Perform a Breadth First Search, returning the path that links the "root" node to the "target" node.
+        N, indptr, indices = self.N, self.indptr, self.indices
+        degree = [indptr[v + 1] - indptr[v] for v in range(N)]
+        visited = bytearray(N)
+        order = []
+
+        # a Breadth First Search from the lowest degree node of each island,
+        # visiting each node's neighbors from the lowest degree to the highest
+        for root in sorted(range(N), key=degree.__getitem__):
+            if visited[root]:
+                continue
+            visited[root] = 1
+            order.append(root)
+
+            # `order` itself works as the queue, from the k-th node onwards
+            k = len(order) - 1
+            while k < len(order):
+                curr = order[k]
+                k += 1
+
+                neighbors = indices[indptr[curr] : indptr[curr + 1]]
+                for node in sorted(neighbors, key=degree.__getitem__):
+                    if not visited[node]:
+                        visited[node] = 1
+                        order.append(node)
+
+        order.reverse()
+        perm = array("i", order)
+
+        # new index of each old node
+        new_index = array("i", [0]) * N
+        for new, old in enumerate(perm):
+            new_index[old] = new
+
+        # rebuild the CSR arrays and the matrix rows with the new indexes
+        new_indptr = array("i", [0]) * (N + 1)
+        new_indices = array("i")
+        M = [0] * N
+        for new, old in enumerate(perm):
+            neighbors = [
+                new_index[node] for node in indices[indptr[old] : indptr[old + 1]]
+            ]
+            new_indptr[new + 1] = new_indptr[new] + len(neighbors)
+            new_indices.extend(neighbors)
+            for node in neighbors:
+                M[new] |= 1 << node
+
+        self.matrix = M
+        self.indptr = new_indptr
+        self.indices = new_indices
+
+        return perm
+
+    def bfs(self, root: int) -> array:
+        """
+        Perform a Breadth First Search, returning the distance from the "root" node to every node.
 
         Parameters
         ----------
             root (int): the initial node's index.
-            target (int): the target node's index.
 
         Returns
         -------
-            list[int]: path starting at "root" and ending at "target".
+            array[int]: distance from "root" to each node (-1 if there's no path to it).
         """
-        # list of all paths to be analyzed (the next node to be
-        # visited is the last one on each path) - works as queue
-        to_analyze = [[root]]
-
-        # list of all nodes already analyzed
-        history = set([])
-
-        # while to_analyze is not empty
-        while to_analyze:
-            # current path (FIFO)
-            path = to_analyze.pop(0)
-            # currently being analyzed node
-            curr = path[-1]
-
-            # if the current node was already analyzed, skip it
-            if curr in history:
-                continue
+        return bfs_csr(self.indptr, self.indices, root, self.N)
 
-            # gets the current node's adjacency list
-            adjacencies = [node for node in self.neighbors[curr] if node not in history]
-
-            # if the target is found
-            if target in adjacencies:
-                return path + [target]
+    def distance_matrix(self) -> list[array]:
+        """
+        Calculate the distance between every pair of nodes, with a Breadth First Search from each of them.
 
-            history.add(curr)
+        Returns
+        -------
+            list[array[int]]: each element [i][j] is the distance between the nodes of indexes i and j.
+        """
+        bfs = partial(bfs_csr, self.indptr, self.indices, N=self.N)
+        n_cpus = cpu_count() or 1
 
-            # loops through each neighbor node, marking
-            # a new path that ends in it to be analyzed
-            to_analyze.extend([path + [node] for node in adjacencies])
+        if self.N < PARALLEL_MIN_NODES or n_cpus == 1:
+            return list(map(bfs, range(self.N)))
 
-        # if it got out of the loop, it means no path was found
-        return []
+        # each BFS is independent from the others, so they are spread
+        # across worker processes, each one returning its own rows
+        with ProcessPoolExecutor(n_cpus) as executor:
+            chunksize = max(1, self.N // (4 * n_cpus))
+            return list(executor.map(bfs, range(self.N), chunksize=chunksize))
 
 
 if __name__ == "__main__":
@@ -143,11 +256,6 @@ if __name__ == "__main__":
 
     # each element distancies[i][j] is the distance
     # between the graph's nodes of indexes i and j
-    distancies = [[0 for _ in range(graph.N)] for _ in range(graph.N)]
-
-    # calculate each distancy
-    for i in range(graph.N):
-        for j in range(i + 1, graph.N):
-            distancies[i][j] = distancies[j][i] = len(graph.bfs(i, j)) - 1
+    distancies = graph.distance_matrix()
 
     print(matrix_to_string(distancies))
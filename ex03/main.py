@@ -1,4 +1,8 @@
-def read_pajek(filename: str) -> tuple[int, list[tuple[int, int]]]:
+from array import array
+from itertools import accumulate, chain
+
+
+def read_pajek(filename: str) -> tuple[int, array, bool]:
     """
     Read a pajek file and return it's data.
 
@@ -9,65 +13,120 @@ def read_pajek(filename: str) -> tuple[int, list[tuple[int, int]]]:
     Returns
     -------
     int: number of nodes in the graph.
-    list[tuple[int, int]]: directed arcs in the graph, from one node to another.
+    array[int]: directed arcs in the graph, from one node to another - each arc's two nodes, contiguously.
+    bool: if the arcs are undirected edges (to be registered both ways).
     """
     with open(filename, "r") as f:
         n_nodes = int(f.readline().split()[1])  # *Vertices N
         undirected = f.readline().strip().lower() == "*edges"  # *Arcs or *Edges
-        arcs = [
-            tuple(int(n) for n in data.split())
-            for line in f.readlines()
-            if (data := line.strip())
-        ]
+        # parse all the remaining numbers at once
+        arcs = array("i", map(int, f.read().split()))
 
-    if undirected:
-        arcs.extend([tuple(reversed(arc)) for arc in arcs])
+    return n_nodes, arcs, undirected
 
-    return n_nodes, arcs
+
+def dft_csr(indptr: array, indices: array, root: int, N: int) -> list[int]:
+    """
+    Perform a Depth First Traversal over a graph's CSR arrays, returning the list of visited nodes.
+
+    Parameters
+    ----------
+    indptr (array[int]): where each node's neighbors start in `indices` (and end, for the next node).
+    indices (array[int]): all nodes' neighbors, contiguously.
+    root (int): the initial node's index.
+    N (int): the graph's number of nodes.
+
+    Returns
+    -------
+    list[int]: list of all nodes reachable from `root`.
+    """
+    # list of all nodes to be analyzed - works as stack
+    to_analyze = [root]
+    # flags of the nodes already analyzed and the list of them
+    visited = bytearray(N)
+    history = []
+
+    # while to_analyze is not empty
+    while to_analyze:
+        # if the current node was already analyzed, skip it
+        if visited[curr := to_analyze.pop()]:
+            continue
+        visited[curr] = 1
+        history.append(curr)
+
+        # pushs the neigbor nodes to the stack
+        to_analyze.extend(indices[indptr[curr] : indptr[curr + 1]])
+
+    return history
 
 
 class Graph:
     """Class for graph manipulation."""
 
-    def __init__(self, N: int, arcs: list[tuple[int, int]]):
+    def __init__(self, N: int, arcs: list[tuple[int, int]], undirected: bool = False):
         """
         Generate a directional graph's adjacency matrix and each node's adjacency list off of a Pajek file's data.
 
         Parameters
         ----------
         N (int): The graph's number of nodes.
-        edges (list[tuple[int, int]]): Each of the graph's nodes' nodes.
+        edges (list[tuple[int, int]] | array[int]): Each of the graph's nodes' nodes (or all of them contiguously, as returned by `read_pajek`).
+        undirected (bool, default False): if the arcs are undirected edges, registered both ways.
         """
-        if type(N) is not int or type(arcs) is not list:
+        if type(N) is not int or not isinstance(arcs, (list, array)):
             raise TypeError(
                 "`N` must be an `int` and `edges` must be a `list` of `tuples` containing two `int`."
             )
 
-        M = [[0 for _ in range(N)] for _ in range(N)]
-        neighbors: dict[int, set[int]] = {i: set([]) for i in range(N)}
-
-        for edge in arcs:
-            if (
-                type(edge) is not tuple
-                or len(edge) != 2
-                or any([(type(v) is not int) for v in edge])
-            ):
-                raise TypeError(
-                    "`edges` must be a `list` of `tuples` containing two `int`."
-                )
-
-            i, j = [v - 1 for v in edge]
-
-            if i >= N or j >= N:
-                raise ValueError("`edges` contain invalid nodes.")
+        # all arcs' nodes, contiguously - validated at once (instead of arc by arc)
+        if isinstance(arcs, array):
+            nodes, valid = arcs, len(arcs) % 2 == 0
+        else:
+            try:
+                nodes = array("i", chain.from_iterable(arcs))
+                valid = not set(map(len, arcs)) - {2}
+                # (`bool` is an `int` subclass, but it isn't a node)
+                valid = valid and bool not in map(type, chain.from_iterable(arcs))
+            except TypeError:  # an arc isn't a sequence or a node isn't an `int`
+                valid = False
+            except OverflowError:  # a node past a C `int`'s range (so, past N)
+                raise ValueError("`edges` contain invalid nodes.") from None
+
+        if not valid:
+            raise TypeError(
+                "`edges` must be a `list` of `tuples` containing two `int`."
+            )
 
-            # register arc
-            M[i][j] = 1
-            neighbors[i].add(j)
+        if nodes and (min(nodes) < 1 or max(nodes) > N):
+            raise ValueError("`edges` contain invalid nodes.")
+
+        # (1-based) endpoints of each arc
+        sources, targets = nodes[0::2], nodes[1::2]
+        if undirected:
+            sources, targets = sources + targets, targets + sources
+
+        # neighbors in CSR form: the neighbors of node
+        # i are indices[indptr[i] : indptr[i + 1]]
+        indptr = array("i", [0]) * (N + 1)
+        for i in sources:
+            indptr[i] += 1  # the nodes are 1-based, so this is (i - 1) + 1
+        indptr = array("i", accumulate(indptr))
+
+        # each row is a bitset: the bit j of M[i] is set if (i, j) is an arc -
+        # filled in the same pass that scatters the arcs into the CSR slices
+        M = [0] * N
+        indices = array("i", [0]) * len(sources)
+        head = indptr[:-1]  # next free position in each node's slice
+        for i, j in zip(sources, targets):
+            i, j = i - 1, j - 1
+            M[i] |= 1 << j
+            indices[head[i]] = j
+            head[i] += 1
 
         self.N = N
         self.matrix = M
-        self.neighbors = neighbors
+        self.indptr = indptr
+        self.indices = indices
 
     def dft(self, root: int) -> list[int]:
         """
@@ -81,42 +140,53 @@ class Graph:
         -------
         list[int]: list of all edges connected `root`.
         """
-        # list of all nodes to be analyzed - works as stack
-        to_analyze = [root]
-        # list of all nodes already analyzed
-        history = set([])
+        return dft_csr(self.indptr, self.indices, root, self.N)
 
-        # while to_analyze is not empty
-        while to_analyze:
-            # if the current node was already analyzed, skip it
-            if (curr := to_analyze.pop()) in history:
-                continue
-            history.add(curr)
+    def islands(self) -> list[int]:
+        """
+        Find the graph's islands (connected nodes, regardless of the arcs' directions) - by joining each arc's nodes in a union-find.
 
-            # gets the current node's adjacency list
-            adjacencies = [node for node in self.neighbors[curr] if node not in history]
-            # pushs the neigbor nodes to the stack
-            to_analyze.extend(adjacencies)
+        Returns
+        -------
+        list[int]: each island's number of nodes.
+        """
+        N, indptr, indices = self.N, self.indptr, self.indices
 
-        return list(history)
+        # each node's parent in its island's tree (the root is its own parent)
+        parent = array("i", range(N))
+        # number of nodes in each root's island
+        size = array("i", [1]) * N
 
+        def find(node: int) -> int:
+            """Find the root of a node's island, pointing every node in the way straight to it."""
+            root = node
+            while parent[root] != root:
+                root = parent[root]
+            while parent[node] != root:
+                parent[node], node = root, parent[node]
+            return root
 
-if __name__ == "__main__":
-    pajek_filename = input().strip()
-    n_nodes, arcs = read_pajek(pajek_filename)
+        for i in range(N):
+            for j in indices[indptr[i] : indptr[i + 1]]:
+                root_i, root_j = find(i), find(j)
+                if root_i == root_j:
+                    continue
 
-    graph = Graph(n_nodes, arcs)
-    visited = set([])
-    islands = []
+                # join the smaller island into the bigger one
+                if size[root_i] < size[root_j]:
+                    root_i, root_j = root_j, root_i
+                parent[root_j] = root_i
+                size[root_i] += size[root_j]
 
-    # count islands
-    for node in range(n_nodes):
-        if node in visited:
-            continue
+        return [size[node] for node in range(N) if parent[node] == node]
+
+
+if __name__ == "__main__":
+    pajek_filename = input().strip()
+    n_nodes, arcs, undirected = read_pajek(pajek_filename)
 
-        connected = graph.dft(node)
-        visited.update(connected)
-        islands.append(len(connected))
+    graph = Graph(n_nodes, arcs, undirected)
+    islands = graph.islands()
 
     # print output
     print(len(islands))
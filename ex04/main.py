@@ -1,4 +1,12 @@
-def read_pajek(filename: str) -> tuple[int, list[tuple[int, int]]]:
+from array import array
+from itertools import accumulate, chain
+
+# colors of the nodes in the Depth First Traversal: not visited yet,
+# visited but with unfinished descendants and completely finished
+WHITE, GRAY, BLACK = 0, 1, 2
+
+
+def read_pajek(filename: str) -> tuple[int, array, bool]:
     """
     Read a pajek file and return it's data.
 
@@ -9,65 +17,136 @@ def read_pajek(filename: str) -> tuple[int, list[tuple[int, int]]]:
     Returns
     -------
     int: number of nodes in the graph.
-    list[tuple[int, int]]: directed arcs in the graph, from one node to another.
+    array[int]: directed arcs in the graph, from one node to another - each arc's two nodes, contiguously.
+    bool: if the arcs are undirected edges (to be registered both ways).
     """
     with open(filename, "r") as f:
         n_nodes = int(f.readline().split()[1])  # *Vertices N
         undirected = f.readline().strip().lower() == "*edges"  # *Arcs or *Edges
-        arcs = [
-            tuple(int(n) for n in data.split())
-            for line in f.readlines()
-            if (data := line.strip())
-        ]
+        # parse all the remaining numbers at once
+        arcs = array("i", map(int, f.read().split()))
 
-    if undirected:
-        arcs.extend([tuple(reversed(arc)) for arc in arcs])
+    return n_nodes, arcs, undirected
 
-    return n_nodes, arcs
+
+def has_cycle_csr(indptr: array, indices: array, root: int, color: bytearray) -> bool:
+    """
+    Determine if there's a cycle reachable from a node - by performing a three-color Depth First Traversal over a graph's CSR arrays.
+
+    Parameters
+    ----------
+    indptr (array[int]): where each node's neighbors start in `indices` (and end, for the next node).
+    indices (array[int]): all nodes' neighbors, contiguously.
+    root (int): the initial node's index.
+    color (bytearray): each node's color, updated in place (BLACK nodes aren't analyzed again).
+
+    Returns
+    -------
+    bool: if a cycle was found.
+    """
+    # nodes in the current path and the position (in `indices`) of
+    # the next neighbor to be analyzed for each of them - works as stack
+    to_analyze = [root]
+    next_neighbor = [indptr[root]]
+    color[root] = GRAY
+
+    # while to_analyze is not empty
+    while to_analyze:
+        # currently being analyzed node (LIFO)
+        curr = to_analyze[-1]
+        k = next_neighbor[-1]
+
+        # if all of its neighbors were analyzed, the node is finished
+        if k == indptr[curr + 1]:
+            color[curr] = BLACK
+            to_analyze.pop()
+            next_neighbor.pop()
+            continue
+
+        next_neighbor[-1] = k + 1
+        node = indices[k]
+
+        # if the neighbor is in the current path, a cycle was found
+        if color[node] == GRAY:
+            return True
+
+        # else, if it wasn't visited yet, go deeper into it
+        if color[node] == WHITE:
+            color[node] = GRAY
+            to_analyze.append(node)
+            next_neighbor.append(indptr[node])
+
+    # if it got out of the loop, it means no cycle was found
+    return False
 
 
 class Graph:
     """Class for graph manipulation."""
 
-    def __init__(self, N: int, arcs: list[tuple[int, int]]):
+    def __init__(self, N: int, arcs: list[tuple[int, int]], undirected: bool = False):
         """
         Generate a directional graph's adjacency matrix and each node's adjacency list off of a Pajek file's data.
 
         Parameters
         ----------
         N (int): The graph's number of nodes.
-        edges (list[tuple[int, int]]): Each of the graph's nodes' nodes.
+        edges (list[tuple[int, int]] | array[int]): Each of the graph's nodes' nodes (or all of them contiguously, as returned by `read_pajek`).
+        undirected (bool, default False): if the arcs are undirected edges, registered both ways.
         """
-        if type(N) is not int or type(arcs) is not list:
+        if type(N) is not int or not isinstance(arcs, (list, array)):
             raise TypeError(
                 "`N` must be an `int` and `edges` must be a `list` of `tuples` containing two `int`."
             )
 
-        M = [[0 for _ in range(N)] for _ in range(N)]
-        neighbors: dict[int, set[int]] = {i: set([]) for i in range(N)}
-
-        for edge in arcs:
-            if (
-                type(edge) is not tuple
-                or len(edge) != 2
-                or any([(type(v) is not int) for v in edge])
-            ):
-                raise TypeError(
-                    "`edges` must be a `list` of `tuples` containing two `int`."
-                )
-
-            i, j = [v - 1 for v in edge]
-
-            if i >= N or j >= N:
-                raise ValueError("`edges` contain invalid nodes.")
+        # all arcs' nodes, contiguously - validated at once (instead of arc by arc)
+        if isinstance(arcs, array):
+            nodes, valid = arcs, len(arcs) % 2 == 0
+        else:
+            try:
+                nodes = array("i", chain.from_iterable(arcs))
+                valid = not set(map(len, arcs)) - {2}
+                # (`bool` is an `int` subclass, but it isn't a node)
+                valid = valid and bool not in map(type, chain.from_iterable(arcs))
+            except TypeError:  # an arc isn't a sequence or a node isn't an `int`
+                valid = False
+            except OverflowError:  # a node past a C `int`'s range (so, past N)
+                raise ValueError("`edges` contain invalid nodes.") from None
+
+        if not valid:
+            raise TypeError(
+                "`edges` must be a `list` of `tuples` containing two `int`."
+            )
 
-            # register arc
-            M[i][j] = 1
-            neighbors[i].add(j)
+        if nodes and (min(nodes) < 1 or max(nodes) > N):
+            raise ValueError("`edges` contain invalid nodes.")
+
+        # (1-based) endpoints of each arc
+        sources, targets = nodes[0::2], nodes[1::2]
+        if undirected:
+            sources, targets = sources + targets, targets + sources
+
+        # neighbors in CSR form: the neighbors of node
+        # i are indices[indptr[i] : indptr[i + 1]]
+        indptr = array("i", [0]) * (N + 1)
+        for i in sources:
+            indptr[i] += 1  # the nodes are 1-based, so this is (i - 1) + 1
+        indptr = array("i", accumulate(indptr))
+
+        # each row is a bitset: the bit j of M[i] is set if (i, j) is an arc -
+        # filled in the same pass that scatters the arcs into the CSR slices
+        M = [0] * N
+        indices = array("i", [0]) * len(sources)
+        head = indptr[:-1]  # next free position in each node's slice
+        for i, j in zip(sources, targets):
+            i, j = i - 1, j - 1
+            M[i] |= 1 << j
+            indices[head[i]] = j
+            head[i] += 1
 
         self.N = N
         self.matrix = M
-        self.neighbors = neighbors
+        self.indptr = indptr
+        self.indices = indices
 
     def island_has_cycle(self, root: int) -> tuple[bool, list[int]]:
         """
@@ -82,31 +161,9 @@ class Graph:
         bool: if the island has a cycle.
         list[int]: list of visited edges.
         """
-        # list of all paths to be analyzed (the next node to be
-        # visited is the last one on each path) - works as stack
-        to_analyze = [[root]]
-
-        # list of all nodes already analyzed
-        history = set([])
-
-        # while to_analyze is not empty
-        while to_analyze:
-            # current path (LIFO)
-            path = to_analyze.pop()
-            # currently being analyzed node
-            curr = path[-1]
-
-            history.add(curr)
-
-            # loop through each neighbor node, marking
-            # a new path that ends in it to be analyzed
-            for node in self.neighbors[curr]:
-                if node in path:  # if a cycle was found
-                    return True, list(history)
-                to_analyze.append(path + [node])
-
-        # if it got out of the loop, it means no cycle was found
-        return False, list(history)
+        color = bytearray(self.N)
+        has_cycle = has_cycle_csr(self.indptr, self.indices, root, color)
+        return has_cycle, [node for node in range(self.N) if color[node] != WHITE]
 
     def has_cycle(self) -> bool:
         """
@@ -116,25 +173,21 @@ class Graph:
         -------
         bool: if the graph has a cycle.
         """
-        visited = set([])
+        # shared by all islands, so that no node is analyzed twice
+        color = bytearray(self.N)
 
         # look for cycles in each island
         for node in range(self.N):
-            if node in visited:
-                continue
-
-            has_cycle, connected = self.island_has_cycle(node)
-
-            if has_cycle:
+            if color[node] == WHITE and has_cycle_csr(
+                self.indptr, self.indices, node, color
+            ):
                 return True
-            else:
-                visited.update(connected)
 
         return False
 
 
 if __name__ == "__main__":
     pajek_filename = input().strip()
-    n_nodes, arcs = read_pajek(pajek_filename)
-    graph = Graph(n_nodes, arcs)
+    n_nodes, arcs, undirected = read_pajek(pajek_filename)
+    graph = Graph(n_nodes, arcs, undirected)
     print("S" if graph.has_cycle() else "N")
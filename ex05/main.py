@@ -1,4 +1,6 @@
+from array import array
 from heapq import heappop, heappush
+from itertools import accumulate, chain
 from sys import maxsize as inf
 
 
@@ -19,22 +21,18 @@ def matrix_to_string(mat: list[list[int]]):
         """Parse a number to string, converting the `inf` number to the 'inf' string."""
         return str(n) if n != inf else "inf"
 
-    # length of the highest number in each column
-    max_len_in_col = [
-        max([len(parse_str(row[j])) for row in mat]) for j in range(len(mat[0]))
-    ]
+    cells = [[parse_str(n) for n in row] for row in mat]
 
-    string = ""
-    for row in mat:
-        for j in range(len(row)):
-            string += parse_str(row[j]).rjust(max_len_in_col[j])
-            string += " " if j < len(row) - 1 else "\n"
+    # length of the highest number in each column
+    max_len_in_col = [max(map(len, col)) for col in zip(*cells)]
 
-    # remove trailing newline
-    return string.rstrip()
+    return "\n".join(
+        " ".join(cell.rjust(length) for cell, length in zip(row, max_len_in_col))
+        for row in cells
+    )
 
 
-def read_pajek(filename: str) -> tuple[int, list[tuple[int, int, int]]]:
+def read_pajek(filename: str) -> tuple[int, array, bool]:
     """
     Read a pajek file and return it's data.
 
@@ -45,65 +43,132 @@ def read_pajek(filename: str) -> tuple[int, list[tuple[int, int, int]]]:
     Returns
     -------
     int: number of nodes in the graph.
-    list[tuple[int, int, int]]: directed arcs/undirected edges in the graph, from one node to another.
+    array[int]: directed arcs/undirected edges in the graph, from one node to another - each arc's two nodes and distance, contiguously.
+    bool: if the arcs are undirected edges (to be registered both ways).
     """
     with open(filename, "r") as f:
         n_nodes = int(f.readline().split()[1])  # *Vertices N
         undirected = f.readline().strip().lower() == "*edges"  # *Arcs or *Edges
-        arcs = [
-            tuple(int(n) for n in data.split())
-            for line in f.readlines()
-            if (data := line.strip())
-        ]
+        # parse all the remaining numbers at once
+        arcs = array("q", map(int, f.read().split()))
 
-    if undirected:
-        arcs.extend([tuple(reversed(arc)) for arc in arcs])
+    return n_nodes, arcs, undirected
 
-    return n_nodes, arcs
+
+def dijkstra_csr(
+    indptr: array, indices: array, weights: array, root: int, N: int
+) -> list[int]:
+    """
+    Determine the shortest distance from a node to every node with Dijkstra's Shortest Path Algorithm, over a graph's CSR arrays.
+
+    Parameters
+    ----------
+    indptr (array[int]): where each node's arcs start in `indices` (and end, for the next node).
+    indices (array[int]): all arcs' target nodes, contiguously.
+    weights (array[int]): all arcs' distances, aligned with `indices`.
+    root (int): the initial node's index.
+    N (int): the graph's number of nodes.
+
+    Returns
+    -------
+    list[int]: shortest distance between `root` and each node (`inf` if there's no path).
+    """
+    dist = [inf] * N  # shortest distance found so far to each node
+    dist[root] = 0
+    to_analyze = [(0, root)]  # paths enqued (cost, node)
+
+    while to_analyze:
+        cost, curr = heappop(to_analyze)
+
+        # if the node was already reached by a shorter path, skip it
+        if cost > dist[curr]:
+            continue
+
+        # relax each arc leaving the current node
+        start, end = indptr[curr], indptr[curr + 1]
+        for neighbor, weight in zip(indices[start:end], weights[start:end]):
+            new_cost = cost + weight
+            if new_cost < dist[neighbor]:
+                dist[neighbor] = new_cost
+                heappush(to_analyze, (new_cost, neighbor))
+
+    return dist
 
 
 class Graph:
     """Class for graph manipulation."""
 
-    def __init__(self, N: int, arcs: list[tuple[int, int, int]]):
+    def __init__(
+        self, N: int, arcs: list[tuple[int, int, int]], undirected: bool = False
+    ):
         """
         Generate a directional graph's adjacency matrix and each node's adjacency list off of a Pajek file's data.
 
         Parameters
         ----------
         N (int): The graph's number of nodes.
-        arcs (list[tuple[int, int, int]]): Connections and distances between nodes.
+        arcs (list[tuple[int, int, int]] | array[int]): Connections and distances between nodes (or all of them contiguously, as returned by `read_pajek`).
+        undirected (bool, default False): if the arcs are undirected edges, registered both ways.
         """
-        if type(N) is not int or type(arcs) is not list:
+        if type(N) is not int or not isinstance(arcs, (list, array)):
             raise TypeError(
                 "`N` must be an `int` and `arcs` must be a `list` of `tuples` containing two `int`."
             )
 
-        M = [[inf for _ in range(N)] for _ in range(N)]
-        neighbors: dict[int, set[int]] = {i: set([]) for i in range(N)}
-
-        for edge in arcs:
-            if (
-                type(edge) is not tuple
-                or len(edge) != 3
-                or any([(type(v) is not int) for v in edge])
-            ):
-                raise TypeError(
-                    "`arcs` must be a `list` of `tuples` containing three `int`."
-                )
-
-            i, j = [v - 1 for v in edge[:2]]
-
-            if i >= N or j >= N:
-                raise ValueError("`edges` contain invalid nodes.")
+        # all arcs' nodes, contiguously - validated at once (instead of arc by arc)
+        if isinstance(arcs, array):
+            nodes, valid = arcs, len(arcs) % 3 == 0
+        else:
+            try:
+                nodes = array("q", chain.from_iterable(arcs))
+                valid = not set(map(len, arcs)) - {3}
+                # (`bool` is an `int` subclass, but it isn't a node)
+                valid = valid and bool not in map(type, chain.from_iterable(arcs))
+            except TypeError:  # an arc isn't a sequence or a node isn't an `int`
+                valid = False
+            except OverflowError:  # a node or distance past 64 bits
+                raise ValueError("`edges` contain invalid nodes.") from None
+
+        if not valid:
+            raise TypeError(
+                "`arcs` must be a `list` of `tuples` containing three `int`."
+            )
 
-            # register arc with given distance
-            M[i][j] = edge[2]
-            neighbors[i].add(j)
+        # (1-based) endpoints and distance of each arc
+        sources, targets, lengths = nodes[0::3], nodes[1::3], nodes[2::3]
+        if undirected:
+            sources, targets = sources + targets, targets + sources
+            lengths += lengths
+
+        if nodes and (
+            min(min(sources), min(targets)) < 1 or max(max(sources), max(targets)) > N
+        ):
+            raise ValueError("`edges` contain invalid nodes.")
+
+        # neighbors in CSR form: the neighbors of node
+        # i are indices[indptr[i] : indptr[i + 1]]
+        indptr = array("i", [0]) * (N + 1)
+        for i in sources:
+            indptr[i] += 1  # the nodes are 1-based, so this is (i - 1) + 1
+        indptr = array("i", accumulate(indptr))
+
+        # and the distance of each of those arcs in weights, while the flat N*N
+        # buffer (the cell (i, j) is stored at i*N + j) is filled in the same pass
+        M = array("q", [inf]) * (N * N)
+        indices = array("i", [0]) * len(sources)
+        weights = array("q", [0]) * len(sources)
+        head = indptr[:-1]  # next free position in each node's slice
+        for i, j, w in zip(sources, targets, lengths):
+            i, j = i - 1, j - 1
+            M[i * N + j] = w
+            indices[head[i]], weights[head[i]] = j, w
+            head[i] += 1
 
         self.N = N
         self.matrix = M
-        self.neighbors = neighbors
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
 
     def dijkstra(self, root: int, target: int) -> int:
         """
@@ -118,39 +183,37 @@ class Graph:
         -------
         int: shortesst distance between `root` and `target`.
         """
-        if root == target:
-            return 0
+        return self.dijkstra_all(root)[target]
 
-        to_analyze = [(0, root)]  # paths enqued (cost, node)
-        history = set([])  # nodes already analyzed
+    def dijkstra_all(self, root: int) -> list[int]:
+        """
+        Determine the shortest distance from a node to every node with Dijkstra's Shortest Path Algorithm.
 
-        while to_analyze:
-            cost, curr = heappop(to_analyze)
+        Parameters
+        ----------
+        root (int): the initial node's index.
 
-            if curr == target:
-                return cost
-            history.add(curr)
+        Returns
+        -------
+        list[int]: shortest distance between `root` and each node (`inf` if there's no path).
+        """
+        return dijkstra_csr(self.indptr, self.indices, self.weights, root, self.N)
 
-            for neighbor in self.neighbors[curr]:
-                if neighbor not in history:
-                    heappush(
-                        to_analyze,
-                        (self.matrix[curr][neighbor] + cost, neighbor),
-                    )
+    def distance_matrix(self) -> list[list[int]]:
+        """
+        Determine the shortest distance between every pair of nodes, running Dijkstra's algorithm once from each node.
 
-        # no path found
-        return inf
+        Returns
+        -------
+        list[list[int]]: each element [i][j] is the shortest distance from the node `i` to the node `j`.
+        """
+        return [self.dijkstra_all(root) for root in range(self.N)]
 
 
 if __name__ == "__main__":
     pajek_filename = input().strip()
-    n_nodes, arcs = read_pajek(pajek_filename)
-    graph = Graph(n_nodes, arcs)
-
-    distancies_matrix = [[0 for _ in range(graph.N)] for _ in range(graph.N)]
-
-    for i in range(len(distancies_matrix)):
-        for j in range(len(distancies_matrix[0])):
-            distancies_matrix[i][j] = graph.dijkstra(i, j)
+    n_nodes, arcs, undirected = read_pajek(pajek_filename)
+    graph = Graph(n_nodes, arcs, undirected)
 
+    distancies_matrix = graph.distance_matrix()
     print(matrix_to_string(distancies_matrix))
@@ -1,3 +1,7 @@
+from array import array
+from itertools import accumulate, chain
+
+
 def read_pajek_from_stdin() -> tuple[int, list[tuple[int, int]]]:
     """
     Read a pajek file-like input from STDIN and return it's data.
@@ -47,31 +51,50 @@ class Graph:
                 "`N` must be an `int` and `edges` must be a `list` of `tuples` containing two `int`."
             )
 
-        M = [[0 for _ in range(N)] for _ in range(N)]
-        neighbors: dict[int, set[int]] = {i: set([]) for i in range(N)}
-
-        for edge in arcs:
-            if (
-                type(edge) is not tuple
-                or len(edge) != 2
-                or any([(type(v) is not int) for v in edge])
-            ):
-                raise TypeError(
-                    "`edges` must be a `list` of `tuples` containing two `int`."
-                )
-
-            i, j = [v - 1 for v in edge]
-
-            if i >= N or j >= N:
-                raise ValueError("`edges` contain invalid nodes.")
+        # all arcs' nodes, contiguously - validated at once (instead of arc by arc)
+        try:
+            nodes = array("i", chain.from_iterable(arcs))
+            valid = not set(map(len, arcs)) - {2}
+            # (`bool` is an `int` subclass, but it isn't a node)
+            valid = valid and bool not in map(type, chain.from_iterable(arcs))
+        except TypeError:  # an arc isn't a sequence or a node isn't an `int`
+            valid = False
+        except OverflowError:  # a node past a C `int`'s range (so, past N)
+            raise ValueError("`edges` contain invalid nodes.") from None
+
+        if not valid:
+            raise TypeError(
+                "`edges` must be a `list` of `tuples` containing two `int`."
+            )
 
-            # register arc
-            M[i][j] = 1
-            neighbors[i].add(j)
+        if nodes and (min(nodes) < 1 or max(nodes) > N):
+            raise ValueError("`edges` contain invalid nodes.")
+
+        # (1-based) endpoints of each arc
+        sources, targets = nodes[0::2], nodes[1::2]
+
+        # neighbors in CSR form: the neighbors of node
+        # i are indices[indptr[i] : indptr[i + 1]]
+        indptr = array("i", [0]) * (N + 1)
+        for i in sources:
+            indptr[i] += 1  # the nodes are 1-based, so this is (i - 1) + 1
+        indptr = array("i", accumulate(indptr))
+
+        # each row is a bitset: the bit j of M[i] is set if (i, j) is an arc -
+        # filled in the same pass that scatters the arcs into the CSR slices
+        M = [0] * N
+        indices = array("i", [0]) * len(sources)
+        head = indptr[:-1]  # next free position in each node's slice
+        for i, j in zip(sources, targets):
+            i, j = i - 1, j - 1
+            M[i] |= 1 << j
+            indices[head[i]] = j
+            head[i] += 1
 
         self.N = N
         self.matrix = M
-        self.neighbors = neighbors
+        self.indptr = indptr
+        self.indices = indices
 
 
 if __name__ == "__main__":
@@ -86,7 +109,8 @@ if __name__ == "__main__":
     # remaining nodes can all be assigned the same color
     for target in targets:
         # target - 1 and n + 1 because the graph's indexes start at 0
-        neighbors = graph.neighbors[target - 1]
+        # (as a set, since the same edge may be listed more than once)
+        neighbors = set(graph.indices[graph.indptr[target - 1] : graph.indptr[target]])
         if len([n for n in neighbors if n + 1 in targets]) > 1:
             print(target)
             break
@@ -1,8 +1,43 @@
+from array import array
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from heapq import heappop, heappush
-from sys import maxsize as inf
+from itertools import accumulate, chain
+from mmap import ACCESS_READ, mmap
+from numbers import Integral
+from os import cpu_count
 
+# the highest distance an array("q") holds: no edge to a node is known yet
+NO_EDGE = 2**63 - 1
 
-def read_pajek(filename: str) -> tuple[int, list[tuple[int, int, int]]]:
+# below this size of a pajek file's arcs, starting worker
+# processes costs more than parsing them in this process
+PARALLEL_MIN_BYTES = 2**24
+
+# distances from which Prim's bucket queue would take more memory than it's worth
+BUCKETS_MAX_WEIGHT = 2**16
+
+
+def parse_pajek_chunk(filename: str, start: int, end: int) -> array:
+    """
+    Parse all numbers in a slice of a pajek file.
+
+    Parameters
+    ----------
+    filename (str): pajek file's name.
+    start (int): the slice's first byte's position (at the start of a line).
+    end (int): the position after the slice's last byte (at the end of a line).
+
+    Returns
+    -------
+    array[int]: the slice's numbers, in order.
+    """
+    with open(filename, "rb") as f, mmap(f.fileno(), 0, access=ACCESS_READ) as mm:
+        return array("q", map(int, mm[start:end].split()))
+
+
+def read_pajek(filename: str) -> tuple[int, array, bool]:
     """
     Read a pajek file and return it's data.
 
@@ -13,105 +48,332 @@ def read_pajek(filename: str) -> tuple[int, list[tuple[int, int, int]]]:
     Returns
     -------
     int: number of nodes in the graph.
-    list[tuple[int, int, int]]: directed arcs/undirected edges in the graph, from one node to another.
+    array[int]: directed arcs/undirected edges in the graph, from one node to another - each arc's two nodes and distance, contiguously.
+    bool: if the arcs are undirected edges (to be registered both ways).
+    """
+    # the file is mapped into memory (and paged in by the OS as it's read), so its
+    # lines are sliced off of it as bytes, with no buffering or decoding
+    with open(filename, "rb") as f, mmap(f.fileno(), 0, access=ACCESS_READ) as mm:
+        n_nodes = int(mm.readline().split()[1])  # *Vertices N
+        undirected = mm.readline().strip().lower() == b"*edges"  # *Arcs or *Edges
+        start, size = mm.tell(), len(mm)
+        n_cpus = cpu_count() or 1
+
+        if size - start < PARALLEL_MIN_BYTES or n_cpus == 1:
+            # one line at a time, so the file is never held in memory as a whole
+            lines = iter(mm.readline, b"")
+            arcs = array(
+                "q", chain.from_iterable(map(int, line.split()) for line in lines)
+            )
+
+        else:
+            # the lines are independent from each other, so they're split into
+            # a chunk per worker process (each one ending at a line break)
+            bounds = [start]
+            for k in range(1, n_cpus):
+                line_end = mm.find(b"\n", start + k * (size - start) // n_cpus)
+                bounds.append(max(bounds[-1], line_end + 1 if line_end >= 0 else size))
+            bounds.append(size)
+
+            arcs = array("q")
+            with ProcessPoolExecutor(n_cpus) as executor:
+                parse = partial(parse_pajek_chunk, filename)
+                for chunk in executor.map(parse, bounds[:-1], bounds[1:]):
+                    arcs += chunk
+
+    return n_nodes, arcs, undirected
+
+
+def prim_csr(indptr: array, indices: array, weights: array, N: int) -> int:
+    """
+    Determine the minimum spanning tree's total cost with Prim's Algorithm, over a graph's CSR arrays.
+
+    Parameters
+    ----------
+    indptr (array[int]): where each node's arcs start in `indices` (and end, for the next node).
+    indices (array[int]): all arcs' target nodes, contiguously.
+    weights (array[int]): all arcs' distances, aligned with `indices`.
+    N (int): the graph's number of nodes.
+
+    Returns
+    -------
+    int: the sum of the minimum spanning tree's edges' distances.
     """
-    with open(filename, "r") as f:
-        n_nodes = int(f.readline().split()[1])  # *Vertices N
-        undirected = f.readline().strip().lower() == "*edges"  # *Arcs or *Edges
-        arcs = [
-            tuple(int(n) for n in data.split())
-            for line in f.readlines()
-            if (data := line.strip())
-        ]
+    # an empty graph has an empty spanning tree
+    if N == 0:
+        return 0
+
+    key = [NO_EDGE] * N  # lightest known edge from the analyzed nodes to each node
+    key[0] = 0
+    to_analyze = [(0, 0)]  # paths enqued (cost, node)
+    history = bytearray(N)  # if each node was already analyzed
+    settled = 0  # how many nodes were analyzed
+    acc_cost = 0
 
-    if undirected:
-        arcs.extend([(*reversed(arc[:2]), *arc[2:]) for arc in arcs])
+    while settled < N:
+        # no path leads out of the analyzed nodes, so some can't be spanned
+        if not to_analyze:
+            raise ValueError("The graph isn't connected.")
 
-    return n_nodes, arcs
+        cost, curr = heappop(to_analyze)
+
+        if history[curr]:
+            continue
+        else:
+            acc_cost += cost
+            history[curr] = 1
+            settled += 1
+
+        # only enqueue a path if it's lighter than any other to the same node (a
+        # decrease-key): the node's heavier paths left in the heap are skipped
+        start, end = indptr[curr], indptr[curr + 1]
+        for neighbor, weight in zip(indices[start:end], weights[start:end]):
+            if weight < key[neighbor] and not history[neighbor]:
+                key[neighbor] = weight
+                heappush(to_analyze, (weight, neighbor))
+
+    # no path found
+    return acc_cost
+
+
+def prim_buckets(
+    indptr: array, indices: array, weights: array, N: int, w_max: int
+) -> int:
+    """
+    Determine the minimum spanning tree's total cost with Prim's Algorithm, over a graph's CSR arrays, queueing the nodes in one bucket per distance instead of a heap (for small non negative integer distances).
+
+    Parameters
+    ----------
+    indptr (array[int]): where each node's arcs start in `indices` (and end, for the next node).
+    indices (array[int]): all arcs' target nodes, contiguously.
+    weights (array[int]): all arcs' distances, aligned with `indices` (all of them in [0, w_max]).
+    N (int): the graph's number of nodes.
+    w_max (int): the graph's highest distance.
+
+    Returns
+    -------
+    int: the sum of the minimum spanning tree's edges' distances.
+    """
+    # an empty graph has an empty spanning tree
+    if N == 0:
+        return 0
+
+    key = [NO_EDGE] * N  # lightest known edge from the analyzed nodes to each node
+    key[0] = 0
+    buckets: list[list[int]] = [[] for _ in range(w_max + 1)]  # nodes enqued by cost
+    buckets[0].append(0)
+    # the bit c is set if buckets[c] isn't empty, so the lightest bucket is found
+    # with C-level int operations (instead of walking through the empty ones)
+    non_empty = 1
+    history = bytearray(N)  # if each node was already analyzed
+    settled = 0  # how many nodes were analyzed
+    acc_cost = 0
+
+    while settled < N:
+        # no path leads out of the analyzed nodes, so some can't be spanned
+        if not non_empty:
+            raise ValueError("The graph isn't connected.")
+
+        cost = (non_empty & -non_empty).bit_length() - 1  # lowest set bit
+        bucket = buckets[cost]
+        curr = bucket.pop()
+        if not bucket:
+            non_empty ^= 1 << cost
+
+        if history[curr]:
+            continue
+        else:
+            acc_cost += cost
+            history[curr] = 1
+            settled += 1
+
+        start, end = indptr[curr], indptr[curr + 1]
+        for neighbor, weight in zip(indices[start:end], weights[start:end]):
+            if weight < key[neighbor] and not history[neighbor]:
+                key[neighbor] = weight
+
+                # (unlike Dijkstra's, Prim's costs don't grow monotonically, so
+                # the bucket may be lighter than the current one)
+                bucket = buckets[weight]
+                if not bucket:
+                    non_empty |= 1 << weight
+                bucket.append(neighbor)
+
+    return acc_cost
 
 
 class Graph:
     """Class for graph manipulation."""
 
-    def __init__(self, N: int, arcs: list[tuple[int, int, int]]):
+    # fixed attributes, with no per-instance `__dict__`
+    __slots__ = ("N", "indptr", "indices", "weights", "_matrix")
+
+    def __init__(
+        self, N: int, arcs: list[tuple[int, int, int]], undirected: bool = False
+    ):
         """
-        Generate a graph's adjacency matrix and each node's adjacency list off of a Pajek file's data.
+        Generate each node's adjacency list (in CSR form) off of a Pajek file's data.
 
         Parameters
         ----------
         N (int): The graph's number of nodes.
-        arcs (list[tuple[int, int, int]]): Connections and distances between nodes.
+        arcs (Sequence[tuple[int, int, int]] | array[int]): Connections and distances between nodes (or all of them contiguously, as returned by `read_pajek`).
+        undirected (bool, default False): if the arcs are undirected edges, registered both ways.
         """
-        if type(N) is not int or type(arcs) is not list:
+        # any sequence of arcs is accepted (but not one-shot iterators, which
+        # would be exhausted by checking their lengths before being parsed)
+        if not isinstance(N, Integral) or isinstance(N, bool):
+            raise TypeError("`N` must be an `int`.")
+        if not isinstance(arcs, (Sequence, array)):
             raise TypeError(
-                "`N` must be an `int` and `arcs` must be a `list` of `tuples` containing two `int`."
+                "`arcs` must be a `list` of `tuples` containing three `int`."
             )
 
-        M = [[inf for _ in range(N)] for _ in range(N)]
-        neighbors: dict[int, set[int]] = {i: set([]) for i in range(N)}
-
-        for edge in arcs:
-            if (
-                type(edge) is not tuple
-                or len(edge) != 3
-                or any([(type(v) is not int) for v in edge])
-            ):
-                raise TypeError(
-                    "`arcs` must be a `list` of `tuples` containing three `int`."
-                )
+        # all arcs' values, contiguously - validated at once (instead of arc by arc)
+        if isinstance(arcs, array):
+            valid = len(arcs) % 3 == 0
+        else:
+            try:
+                valid = not set(map(len, arcs)) - {3}
+                # (`bool` is an `int` subclass, but it isn't a node or a distance)
+                valid = valid and bool not in map(type, chain.from_iterable(arcs))
+                arcs = array("q", chain.from_iterable(arcs))
+            except TypeError:  # an arc isn't a sequence or a value isn't an `int`
+                valid = False
+            except OverflowError:  # a node or distance past 64 bits
+                raise ValueError("`edges` contain invalid nodes.") from None
+
+        if not valid:
+            raise TypeError(
+                "`arcs` must be a `list` of `tuples` containing three `int`."
+            )
 
-            i, j = [v - 1 for v in edge[:2]]
+        # (1-based) endpoints and distance of each arc
+        sources, targets, lengths = arcs[0::3], arcs[1::3], arcs[2::3]
 
-            if i >= N or j >= N:
-                raise ValueError("`edges` contain invalid nodes.")
+        if arcs and (
+            min(min(sources), min(targets)) < 1 or max(max(sources), max(targets)) > N
+        ):
+            raise ValueError("`edges` contain invalid nodes.")
 
-            # register arc with given distance
-            M[i][j] = edge[2]
-            neighbors[i].add(j)
+        # an undirected edge is registered from both of its nodes, straight
+        # off of the same columns (instead of a copy of the arcs, reversed)
+        directions = [(sources, targets)]
+        if undirected:
+            directions.append((targets, sources))
+
+        # neighbors in CSR form: the neighbors of node
+        # i are indices[indptr[i] : indptr[i + 1]]
+        indptr = array("i", [0]) * (N + 1)
+        for froms, _ in directions:
+            for i in froms:
+                indptr[i] += 1  # the nodes are 1-based, so this is (i - 1) + 1
+        indptr = array("i", accumulate(indptr))
+
+        # and the distance of each of those arcs in weights
+        indices = array("i", [0]) * indptr[-1]
+        weights = array("q", [0]) * indptr[-1]
+        head = indptr[:-1]  # next free position in each node's slice
+        for froms, tos in directions:
+            for i, j, w in zip(froms, tos, lengths):
+                i, j = i - 1, j - 1
+                indices[head[i]], weights[head[i]] = j, w
+                head[i] += 1
 
         self.N = N
-        self.matrix = M
-        self.neighbors = neighbors
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self._matrix = None  # only built if it's ever needed
+
+    @property
+    def matrix(self) -> list[list[int]]:
+        """
+        Getter for the graph's adjacency matrix, built off of the CSR arrays on the first access.
+
+        Returns
+        -------
+        list[list[int]]: each arc's distance (the lightest one, if there are parallel arcs), or `NO_EDGE`.
+        """
+        if self._matrix is None:
+            M = [[NO_EDGE] * self.N for _ in range(self.N)]
+
+            for i, row in enumerate(M):
+                start, end = self.indptr[i], self.indptr[i + 1]
+                for j, w in zip(self.indices[start:end], self.weights[start:end]):
+                    if w < row[j]:
+                        row[j] = w
+
+            self._matrix = M
+
+        return self._matrix
 
     def prim(self) -> int:
         """
-        Determine the shortest distance between two nodes with Dijkstra's Shortest Path Algorithm.
+        Determine the minimum spanning tree's total cost with Prim's Algorithm.
 
-        Parameters
-        ----------
-        root (int): the initial node's index.
-        target (int): the target node's index.
+        Returns
+        -------
+        int: the sum of the minimum spanning tree's edges' distances.
+        """
+        # the buckets beat the heap when many nodes are enqued at once (at least 4 arcs
+        # per node) and each bucket operation (costing up to w_max/64 words) is paid
+        # for by the arcs - in dense graphs, most time is spent on the arcs either way
+        n_arcs = len(self.weights)
+        if 4 * self.N <= n_arcs <= 16 * self.N and min(self.weights) >= 0:
+            w_max = max(self.weights)
+            if w_max < BUCKETS_MAX_WEIGHT and w_max * self.N <= 512 * n_arcs:
+                return prim_buckets(
+                    self.indptr, self.indices, self.weights, self.N, w_max
+                )
+
+        return prim_csr(self.indptr, self.indices, self.weights, self.N)
+
+    def prim_dense(self) -> int:
+        """
+        Determine the minimum spanning tree's total cost with Prim's Algorithm, scanning all nodes for the closest one at each step (O(N²), with no queue).
+
+        An explicit alternative to `prim`, which doesn't use it: gating the heap on each node's lightest known edge makes `prim` faster even on dense graphs.
 
         Returns
         -------
-        int: shortesst distance between `root` and `target`.
+        int: the sum of the minimum spanning tree's edges' distances.
         """
-        to_analyze = [(0, 0)]  # paths enqued (cost, node)
-        history = set([])  # nodes already analyzed
+        # local names, so that the loop doesn't look up the attributes on every node
+        N, indptr, indices, weights = self.N, self.indptr, self.indices, self.weights
+
+        # an empty graph has an empty spanning tree
+        if N == 0:
+            return 0
+
+        key = [NO_EDGE] * N  # lightest known edge from the tree to each node
+        key[0] = 0
+        in_tree = bytearray(N)
         acc_cost = 0
 
-        while len(history) < self.N:
-            cost, curr = heappop(to_analyze)
+        for _ in range(N):
+            # closest node to the tree (min and index scan the list in C)
+            cost = min(key)
+            curr = key.index(cost)
+
+            # no edge leads out of the tree, so some nodes can't be spanned
+            if cost >= NO_EDGE:
+                raise ValueError("The graph isn't connected.")
 
-            if curr in history:
-                continue
-            else:
-                acc_cost += cost
-                history.add(curr)
+            acc_cost += cost
+            in_tree[curr] = 1
+            key[curr] = NO_EDGE + 1  # so that it's never the closest again
 
-            for neighbor in self.neighbors[curr]:
-                if neighbor not in history:
-                    heappush(
-                        to_analyze,
-                        (self.matrix[curr][neighbor], neighbor),
-                    )
+            start, end = indptr[curr], indptr[curr + 1]
+            for neighbor, weight in zip(indices[start:end], weights[start:end]):
+                if not in_tree[neighbor] and weight < key[neighbor]:
+                    key[neighbor] = weight
 
-        # no path found
         return acc_cost
 
 
 if __name__ == "__main__":
     pajek_filename = input().strip()
-    n_nodes, arcs = read_pajek(pajek_filename)
-    graph = Graph(n_nodes, arcs)
+    n_nodes, arcs, undirected = read_pajek(pajek_filename)
+    graph = Graph(n_nodes, arcs, undirected)
     print(graph.prim())